@@ -1,14 +1,19 @@
 # Copyright 2024 Ole Kliemann
 # SPDX-License-Identifier: MIT
 
-from typing import Sequence
+from importlib import import_module
+from typing import Any, Sequence, TYPE_CHECKING
 
-from drresult.result import Result, Ok, Err, Panic
-from drresult.function_decorators import noexcept, returns_result
-from drresult.class_decorators import constructs_as_result
-from drresult.option import Some
-from drresult.gather_result import gather_result
-from drresult.logging import log_panic
+if TYPE_CHECKING:
+    from drresult.result import Result, Ok, Err, Panic, install_excepthook
+    from drresult.function_decorators import noexcept, returns_result
+    from drresult.class_decorators import constructs_as_result
+    from drresult.option import Some
+    from drresult.logging import log_panic
+
+# `gather_result` is also the name of its submodule. Importing that submodule binds the
+# module to this package attribute and `__getattr__` would never run, so it is imported eagerly.
+from drresult.gather_result import gather_result, gather
 
 __all__: Sequence[str] = [
     'Result',
@@ -19,6 +24,42 @@ __all__: Sequence[str] = [
     'returns_result',
     'Some',
     'gather_result',
+    'gather',
     'constructs_as_result',
     'log_panic',
+    'install_excepthook',
 ]
+
+# Submodules are only imported once one of their names is first accessed.
+_lazy_attributes: dict[str, str] = {
+    'Result': 'drresult.result',
+    'Ok': 'drresult.result',
+    'Err': 'drresult.result',
+    'Panic': 'drresult.result',
+    'noexcept': 'drresult.function_decorators',
+    'returns_result': 'drresult.function_decorators',
+    'Some': 'drresult.option',
+    'constructs_as_result': 'drresult.class_decorators',
+    'log_panic': 'drresult.logging',
+    'install_excepthook': 'drresult.result',
+}
+
+# Submodules that are not imported yet are still reachable as attributes, e.g. `drresult.option`.
+_lazy_submodules: frozenset[str] = frozenset(
+    {'result', 'function_decorators', 'class_decorators', 'option', 'logging'}
+)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _lazy_submodules:
+        # Importing a submodule binds it to this package, so this runs once per submodule.
+        return import_module(f'{__name__}.{name}')
+    if name not in _lazy_attributes:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(_lazy_attributes[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__) | _lazy_submodules)
@@ -1,8 +1,9 @@
 # Copyright 2024 Ole Kliemann
 # SPDX-License-Identifier: MIT
 
-from typing import Any, Callable, Type, List
-from drresult.result import Result, Ok
+from functools import lru_cache
+from typing import Any, Callable, Sequence
+from drresult.result import Result, Ok, internal_frame_codes
 from drresult.function_decorators import returns_result, expects_default, not_expects_default
 
 """
@@ -16,29 +17,40 @@ Decorators:
 def make_drresult_constructs_as_result_decorator[
     T
 ](
-    expects: List[Type[BaseException]] = expects_default,
-    not_expects: List[Type[BaseException]] = not_expects_default,
-) -> Callable[[Type[T]], Type[T]]:
+    expects: Sequence[type[BaseException]] = expects_default,
+    not_expects: Sequence[type[BaseException]] = not_expects_default,
+) -> Callable[[type[T]], type[T]]:
     """Creates a decorator to wrap class constructors in a `Result` type.
 
+    Decorators are shared between all classes using the same exception lists.
+
     Args:
-        expects (List[Type[BaseException]]): List of expected exceptions.
-        not_expects (List[Type[BaseException]]): List of unexpected exceptions.
+        expects (Sequence[type[BaseException]]): Expected exceptions.
+        not_expects (Sequence[type[BaseException]]): Unexpected exceptions.
 
     Returns:
         Callable: A decorator for classes.
     """
+    return _make_drresult_constructs_as_result_decorator(tuple(expects), tuple(not_expects))
+
 
-    def make_drresult_constructs_as_result_wrapper(cls: Type[T]) -> Type[T]:
+@lru_cache(maxsize=None)
+def _make_drresult_constructs_as_result_decorator(
+    expects: tuple[type[BaseException], ...],
+    not_expects: tuple[type[BaseException], ...],
+) -> Callable[[type[Any]], type[Any]]:
+    def make_drresult_constructs_as_result_wrapper(cls: type[Any]) -> type[Any]:
         Base = type(cls)  # type: Any
 
-        class Meta(Base):
-            @returns_result(expects=expects, not_expects=not_expects)
-            def __call__(cls, *args, **kwargs) -> Result[T]:
-                return cls.drresult_constructs_as_result_wrapper(*args, **kwargs)
+        def drresult_constructs_as_result_wrapper(cls, *args, **kwargs) -> Result[Any]:
+            return Ok(Base.__call__(cls, *args, **kwargs))
 
-            def drresult_constructs_as_result_wrapper(cls, *args, **kwargs) -> Result[T]:
-                return Ok(super(Meta, cls).__call__(*args, **kwargs))
+        internal_frame_codes.add(drresult_constructs_as_result_wrapper.__code__)
+
+        class Meta(Base):
+            __call__: Any = returns_result(expects=expects, not_expects=not_expects)(
+                drresult_constructs_as_result_wrapper
+            )
 
         WrapperBase = cls  # type: Any
 
@@ -52,6 +64,12 @@ def make_drresult_constructs_as_result_decorator[
     return make_drresult_constructs_as_result_wrapper
 
 
+# Decorator used by `@constructs_as_result` and `@constructs_as_result()`, built once at import.
+_constructs_as_result_default = _make_drresult_constructs_as_result_decorator(
+    expects_default, not_expects_default
+)
+
+
 def constructs_as_result[T](*decorator_args: Any, **decorator_kwargs: Any) -> Any:
     """Decorator to wrap class instantiation in a `Result` type.
 
@@ -71,9 +89,8 @@ def constructs_as_result[T](*decorator_args: Any, **decorator_kwargs: Any) -> An
     Returns:
         Any: The decorated class.
     """
-    if len(decorator_args) == 1 and callable(decorator_args[0]) and not decorator_kwargs:
-        return make_drresult_constructs_as_result_decorator(expects_default, not_expects_default)(
-            decorator_args[0]
-        )
-    else:
-        return make_drresult_constructs_as_result_decorator(**decorator_kwargs)
+    if not decorator_kwargs:
+        if len(decorator_args) == 1 and callable(decorator_args[0]):
+            return _constructs_as_result_default(decorator_args[0])
+        return _constructs_as_result_default
+    return make_drresult_constructs_as_result_decorator(**decorator_kwargs)
@@ -1,11 +1,10 @@
 # Copyright 2024 Ole Kliemann
 # SPDX-License-Identifier: MIT
 
-from types import TracebackType
-from typing import Any, Callable, NoReturn, Type, List
-import traceback
+from functools import lru_cache
+from typing import Any, Callable, Sequence
 
-from drresult.result import Result, Err, format_exception, format_traceback, Panic
+from drresult.result import Result, Err, Panic, internal_frame_codes
 
 """
 This module provides decorators for functions to handle expected and unexpected exceptions.
@@ -14,14 +13,40 @@ Decorators:
     - noexcept: Marks a function as not expecting any exceptions.
     - returns_result: Wraps exceptions in a `Result` type based on expected exceptions.
 
+Functions:
+    - bind_wrapper: Copies name and docstring of a function onto its wrapper.
+    - without_subclasses: Removes exceptions covered by another exception in the same tuple.
+
 Constants:
     - LanguageLevelExceptions: Exceptions considered language-level errors.
     - SystemLevelExceptions: Exceptions considered system-level errors.
-    - expects_default: Default list of expected exceptions.
-    - not_expects_default: Default list of unexpected exceptions.
+    - expects_default: Default tuple of expected exceptions.
+    - not_expects_default: Default tuple of unexpected exceptions.
 """
 
 
+def bind_wrapper[W: Callable[..., Any]](wrapper: W, func: Callable[..., Any]) -> W:
+    """Make a wrapper look like the function it wraps.
+
+    Only copies `__name__`, `__qualname__` and `__doc__` and sets `__wrapped__`,
+    which is cheaper than `functools.update_wrapper`.
+
+    Args:
+        wrapper (W): The wrapper function.
+        func (Callable[..., Any]): The wrapped function.
+
+    Returns:
+        W: The wrapper.
+    """
+    for name in ('__name__', '__qualname__', '__doc__'):
+        try:
+            setattr(wrapper, name, getattr(func, name))
+        except AttributeError:
+            pass
+    setattr(wrapper, '__wrapped__', func)
+    return wrapper
+
+
 def noexcept[T](func: Callable[..., T]) -> Callable[..., T]:
     """Decorator to mark a function as not expecting any exceptions.
 
@@ -43,50 +68,84 @@ def noexcept[T](func: Callable[..., T]) -> Callable[..., T]:
         except BaseException as e:
             raise Panic(e) from None
 
-    return wrapper
+    return bind_wrapper(wrapper, func)
 
 
 # Exception lists for internal use
-LanguageLevelExceptions: List[Type[BaseException]] = [
+LanguageLevelExceptions: tuple[type[BaseException], ...] = (
     AssertionError,
     AttributeError,
     ImportError,
     NameError,
     SyntaxError,
     TypeError,
-]
+)
 
-SystemLevelExceptions: List[Type[BaseException]] = [
+SystemLevelExceptions: tuple[type[BaseException], ...] = (
     MemoryError,
     SystemError,
-]
+)
 
-expects_default: List[Type[BaseException]] = [Exception]
-not_expects_default: List[Type[BaseException]] = LanguageLevelExceptions + SystemLevelExceptions
+expects_default: tuple[type[BaseException], ...] = (Exception,)
+not_expects_default: tuple[type[BaseException], ...] = (
+    LanguageLevelExceptions + SystemLevelExceptions
+)
 
 
 def make_drresult_returns_result_decorator[
     T
 ](
-    expects: List[Type[BaseException]] = expects_default,
-    not_expects: List[Type[BaseException]] = not_expects_default,
+    expects: Sequence[type[BaseException]] = expects_default,
+    not_expects: Sequence[type[BaseException]] = not_expects_default,
 ) -> Callable[[Callable[..., Result[T]]], Callable[..., Result[T]]]:
     """Creates a decorator to wrap exceptions in a `Result` type.
 
+    Decorators are shared between all call sites using the same exception lists.
+
     Args:
-        expects (List[Type[BaseException]]): List of expected exceptions.
-        not_expects (List[Type[BaseException]]): List of unexpected exceptions.
+        expects (Sequence[type[BaseException]]): Expected exceptions.
+        not_expects (Sequence[type[BaseException]]): Unexpected exceptions.
 
     Returns:
         Callable: A decorator for functions returning `Result[T]`.
     """
-    expects_tuple = tuple(expects)
-    not_expects_tuple = tuple(not_expects)
+    return _make_drresult_returns_result_decorator(tuple(expects), tuple(not_expects))
+
+
+def without_subclasses(
+    exceptions: tuple[type[BaseException], ...]
+) -> tuple[type[BaseException], ...]:
+    """Remove exceptions already covered by another exception in the same tuple.
+
+    An `except` clause matching the result catches exactly the same exceptions,
+    but has fewer classes to check.
+
+    Args:
+        exceptions (tuple[type[BaseException], ...]): Exceptions to reduce.
+
+    Returns:
+        tuple[type[BaseException], ...]: The exceptions that are no subclass of another one.
+    """
+    unique = tuple(dict.fromkeys(exceptions))
+    return tuple(
+        exception
+        for exception in unique
+        if not any(exception is not other and issubclass(exception, other) for other in unique)
+    )
+
+
+@lru_cache(maxsize=None)
+def _make_drresult_returns_result_decorator(
+    expects: tuple[type[BaseException], ...],
+    not_expects: tuple[type[BaseException], ...],
+) -> Callable[[Callable[..., Result[Any]]], Callable[..., Result[Any]]]:
+    expects_tuple = without_subclasses(expects)
+    not_expects_tuple = without_subclasses(not_expects)
 
     def make_drresult_returns_result_wrapper(
-        func: Callable[..., Result[T]]
-    ) -> Callable[..., Result[T]]:
-        def drresult_returns_result_wrapper(*args: Any, **kwargs: Any) -> Result[T]:
+        func: Callable[..., Result[Any]]
+    ) -> Callable[..., Result[Any]]:
+        def drresult_returns_result_wrapper(*args: Any, **kwargs: Any) -> Result[Any]:
             try:
                 return func(*args, **kwargs)
             except Panic:
@@ -98,11 +157,18 @@ def make_drresult_returns_result_decorator[
             except BaseException as e:
                 raise Panic(e) from None
 
-        return drresult_returns_result_wrapper
+        internal_frame_codes.add(drresult_returns_result_wrapper.__code__)
+        return bind_wrapper(drresult_returns_result_wrapper, func)
 
     return make_drresult_returns_result_wrapper
 
 
+# Decorator used by `@returns_result` and `@returns_result()`, built once at import.
+_returns_result_default = _make_drresult_returns_result_decorator(
+    expects_default, not_expects_default
+)
+
+
 def returns_result[
     T
 ](*decorator_args: Any, **decorator_kwargs: Any) -> (
@@ -126,9 +192,8 @@ def returns_result[
     Returns:
         Callable: The decorator or wrapped function.
     """
-    if len(decorator_args) == 1 and callable(decorator_args[0]) and not decorator_kwargs:
-        return make_drresult_returns_result_decorator(expects_default, not_expects_default)(
-            decorator_args[0]
-        )
-    else:
-        return make_drresult_returns_result_decorator(**decorator_kwargs)
+    if not decorator_kwargs:
+        if len(decorator_args) == 1 and callable(decorator_args[0]):
+            return _returns_result_default(decorator_args[0])
+        return _returns_result_default
+    return make_drresult_returns_result_decorator(**decorator_kwargs)
@@ -1,25 +1,49 @@
 # Copyright 2024 Ole Kliemann
 # SPDX-License-Identifier: MIT
 
-from typing import List, Type, Tuple
+from typing import Callable, Sequence
 
-from drresult.result import Result, Ok, Err, Panic
+from drresult.result import Result, Ok, Err, Panic, internal_frame_codes
 from drresult.function_decorators import expects_default, not_expects_default
 
 """
 This module provides a context manager `gather_result` to capture exceptions and convert them into a `Result`.
 
 Classes:
-    - ResultContainer: Container to hold the result within the context.
     - gather_result: Context manager to capture exceptions as a `Result`.
+    - ResultContainer: Alias of `gather_result`, which holds the result within the context.
+
+Functions:
+    - gather: Calls a function and captures its return value or exception as a `Result`.
 """
 
 
-class ResultContainer[T]:
-    """Container to hold a `Result` within a context."""
+# Result of a block that finishes without setting one, shared as `Ok` is immutable.
+_ok_none: Ok[None] = Ok(None)
+
+
+class gather_result[T]:
+    """Context manager to capture exceptions and convert them into a `Result`.
+
+    The context manager is its own result container.
 
-    def __init__(self) -> None:
-        self._result: Result[T] | Result[None] = Ok(None)
+    Usage:
+        with gather_result() as result_container:
+            # Code that might raise exceptions
+            result_container.set(Ok(value))
+        result = result_container.get()
+    """
+
+    __slots__ = ('_expects', '_not_expects', '_result', '_finalized')
+
+    def __init__(
+        self,
+        expects: Sequence[type[BaseException]] = expects_default,
+        not_expects: Sequence[type[BaseException]] = not_expects_default,
+    ):
+        self._expects: tuple[type[BaseException], ...] = tuple(expects)
+        self._not_expects: tuple[type[BaseException], ...] = tuple(not_expects)
+        self._result: Result[T] | Result[None] = _ok_none
         self._finalized: bool = False
 
     def set(self, result: Result[T]) -> None:
@@ -46,46 +70,72 @@ class ResultContainer[T]:
         assert self._finalized, "Cannot get result when not finalized"
         return self._result
 
-
-class gather_result[T]:
-    """Context manager to capture exceptions and convert them into a `Result`.
-
-    Usage:
-        with gather_result() as result_container:
-            # Code that might raise exceptions
-            result_container.set(Ok(value))
-        result = result_container.get()
-    """
-
-    def __init__(
-        self,
-        expects: List[Type[BaseException]] = expects_default,
-        not_expects: List[Type[BaseException]] = not_expects_default,
-    ):
-        self._expects: Tuple[Type[BaseException], ...] = tuple(expects)
-        self._not_expects: Tuple[Type[BaseException], ...] = tuple(not_expects)
-        self._container: ResultContainer[T] = ResultContainer[T]()
-
     def __enter__(self):
         """Enter the context.
 
         Returns:
-            ResultContainer[T]: The result container.
+            gather_result[T]: The context manager itself, holding the result.
         """
-        return self._container
+        return self
 
     def __exit__(self, exc_type, exc_value, traceback):
         """Exit the context, handling exceptions."""
-        match exc_value:
-            case None:
-                pass
-            case Panic():
-                return False
-            case _ if isinstance(exc_value, self._not_expects):
-                raise Panic(exc_value) from None
-            case _ if isinstance(exc_value, self._expects):
-                self._container.set(Err(exc_value))
-            case _:
-                raise Panic(exc_value) from None
-        self._container._finalized = True
-        return True
+        if exc_type is None:
+            self._finalized = True
+            return True
+        if issubclass(exc_type, Panic):
+            return False
+        if issubclass(exc_type, self._not_expects):
+            raise Panic(exc_value) from None
+        if issubclass(exc_type, self._expects):
+            self.set(Err(exc_value))
+            self._finalized = True
+            return True
+        raise Panic(exc_value) from None
+
+
+ResultContainer = gather_result
+"""Alias kept for backwards compatibility, `gather_result` holds the result itself."""
+
+
+def gather[
+    T
+](
+    func: Callable[[], T],
+    *,
+    expects: Sequence[type[BaseException]] = expects_default,
+    not_expects: Sequence[type[BaseException]] = not_expects_default,
+) -> Result[T]:
+    """Call `func` and capture its return value or exception as a `Result`.
+
+    Equivalent to calling `func` inside a `gather_result` block and setting its return value,
+    without the context manager and container.
+
+    Usage:
+        result = gather(lambda: json.loads(text))
+
+    Args:
+        func (Callable[[], T]): The function to call.
+        expects (Sequence[type[BaseException]]): Expected exceptions. Keyword-only.
+        not_expects (Sequence[type[BaseException]]): Unexpected exceptions. Keyword-only.
+
+    Returns:
+        Result[T]: `Ok` holding the return value, or `Err` holding an expected exception.
+
+    Raises:
+        Panic: If an unexpected exception occurs.
+    """
+    try:
+        return Ok(func())
+    except Panic:
+        raise
+    except tuple(not_expects) as e:
+        raise Panic(e) from None
+    except tuple(expects) as e:
+        return Err(e)
+    except BaseException as e:
+        raise Panic(e) from None
+
+
+# Both re-raise as `Panic`, which would otherwise add their own frame to the trace.
+internal_frame_codes.update((gather_result.__exit__.__code__, gather.__code__))
@@ -1,24 +1,41 @@
 # Copyright 2024 Ole Kliemann
 # SPDX-License-Identifier: MIT
 
-from contextlib import contextmanager
-from drresult.gather_result import gather_result
-from drresult.result import Panic
+from drresult.result import Panic, internal_frame_codes
 import logging
 import sys
+import weakref
 
 """
 This module provides a context manager `log_panic` to log `Panic` exceptions.
 
-Functions:
+Classes:
     - log_panic: Context manager to log `Panic` exceptions using the provided logger.
+
+Functions:
+    - ignore_logged_panic: Exception hook installed once a `Panic` has been logged.
 """
 
+# Panics already logged by `log_panic`, and the hook `ignore_logged_panic` replaced.
+_logged_panics: weakref.WeakSet[Panic] = weakref.WeakSet()
+_previous_excepthook = sys.__excepthook__
+
+
+def ignore_logged_panic(type, e, traceback) -> None:
+    """Exception hook that stays silent for panics already logged by `log_panic`.
+
+    Any other exception is passed on to the hook that was installed before.
+    """
+    if e in _logged_panics:
+        return
+    _previous_excepthook(type, e, traceback)
+
 
-@contextmanager
-def log_panic(logger: logging.Logger):
+class log_panic:
     """Context manager to log `Panic` exceptions.
 
+    Any other exception leaving the context is converted to a `Panic` first.
+
     Args:
         logger (logging.Logger): The logger to use for logging.
 
@@ -27,11 +44,30 @@ def log_panic(logger: logging.Logger):
             # Code that might raise a `Panic`
             pass
     """
-    excepthook = sys.excepthook
-    sys.excepthook = lambda x, y, z: None
-    try:
-        with gather_result(expects=[], not_expects=[BaseException]) as result:
-            yield
-    except Panic as e:
-        logger.critical(f'{e.trace()}')
-        raise
+
+    __slots__ = ('_logger',)
+
+    def __init__(self, logger: logging.Logger) -> None:
+        self._logger = logger
+
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit the context, logging any exception as `Panic`."""
+        global _previous_excepthook
+        if exc_type is None:
+            return False
+        panic = exc_value if issubclass(exc_type, Panic) else Panic(exc_value)
+        self._logger.critical(f'{panic.trace()}')
+        _logged_panics.add(panic)
+        if sys.excepthook is not ignore_logged_panic:
+            _previous_excepthook = sys.excepthook
+            sys.excepthook = ignore_logged_panic
+        if panic is exc_value:
+            return False
+        raise panic from None
+
+
+# Re-raising as `Panic` would otherwise add this frame to the trace.
+internal_frame_codes.add(log_panic.__exit__.__code__)
@@ -1,10 +1,10 @@
 # Copyright 2024 Ole Kliemann
 # SPDX-License-Identifier: MIT
 
-from typing import Type
-
 
 class Some[T]:
+    __slots__ = ('_value',)
+
     def __init__(self, value: T) -> None:
         self._value = value
 
@@ -1,9 +1,15 @@
 # Copyright 2024 Ole Kliemann
 # SPDX-License-Identifier: MIT
 
-from typing import NoReturn, Optional, List
+from types import CodeType, TracebackType
+from typing import NoReturn, TYPE_CHECKING
+from itertools import islice
 import sys
-import traceback
+
+# `traceback` and `linecache` are imported by the functions formatting errors,
+# so programs that never format one do not load them.
+if TYPE_CHECKING:
+    import traceback
 
 """
 This module provides a `Result` type similar to Rust's `std::result`, enabling error handling without exceptions.
@@ -20,25 +26,46 @@ Functions:
     - format_exception: Formats the exception message.
     - format_traceback_exception: Formats the full traceback and exception message.
     - excepthook: Custom exception hook to print formatted exceptions.
+    - install_excepthook: Installs `excepthook` as `sys.excepthook`.
 """
 
 
 class BaseResult[T]:
     """Base class for `Ok` and `Err` result types."""
 
+    __slots__ = ('_value', '_hash')
+
+    _repr_prefix: str
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._repr_prefix = f'{cls.__name__}('
+
     def __init__(self):  # pragma: no cover
         self._value: T
+        self._hash: int
 
     def __str__(self) -> str:
         return self.__repr__()
 
+    def __reduce__(self) -> tuple[type, tuple[T]]:
+        # Rebuilt from the value alone, so the cached hash, repr and trace are not pickled.
+        return (type(self), (self._value,))
+
     def __eq__(self, other: object) -> bool:
+        if type(self) is type(other):
+            return self._value == other._value
         if not isinstance(other, BaseResult):
             return NotImplemented
-        return type(self) is type(other) and self._value == other._value
+        return False
 
     def __hash__(self) -> int:
-        return hash((self.__class__, self._value))
+        # `_hash` stays unset until the first call, so construction does not pay for it.
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash((self.__class__, self._value))
+            return self._hash
 
     def is_ok(self) -> bool:  # pragma: no cover
         """Check if the result is `Ok`.
@@ -56,21 +83,22 @@ class BaseResult[T]:
         """
         return self.is_ok()
 
-    def _unexpected(self, msg: Optional[str] = None) -> NoReturn:
+    def _unexpected(self, msg: str | None = None) -> NoReturn:
         """Raise an `AssertionError` for unexpected method calls.
 
         Args:
-            msg (Optional[str]): Additional message for the error.
+            msg (str | None): Additional message for the error.
 
         Raises:
             AssertionError: Indicating an unexpected call.
         """
-        raise AssertionError(f'{self.__str__()}' + (f': {msg}' if msg else ''))
+        raise AssertionError(f'{self!r}: {msg}' if msg else repr(self))
 
 
 class Ok[T](BaseResult[T]):
     """Represents a successful result."""
 
+    __slots__ = ()
     __match_args__ = ('value',)
 
     def __init__(self, value: T) -> None:
@@ -82,7 +110,7 @@ class Ok[T](BaseResult[T]):
         self._value: T = value
 
     def __repr__(self) -> str:
-        return f'{self.__class__.__name__}({self._value})'
+        return f'{self._repr_prefix}{self._value})'
 
     @property
     def value(self) -> T:
@@ -104,6 +132,9 @@ class Ok[T](BaseResult[T]):
         """
         return False
 
+    def __bool__(self) -> bool:
+        return True
+
     def expect(self, msg: str) -> T:
         """Return the value, ignoring the message.
 
@@ -153,26 +184,15 @@ class Ok[T](BaseResult[T]):
         """
         return self._value
 
-    def unwrap_or_raise(self) -> T:
-        """Return the successful value.
-
-        Returns:
-            T: The value held by `Ok`.
-        """
-        return self._value
-
-    def unwrap_or_return(self) -> T:
-        """Return the successful value.
-
-        Returns:
-            T: The value held by `Ok`.
-        """
-        return self._value
+    # On `Ok` these behave exactly like `unwrap`, so they share its function.
+    unwrap_or_raise = unwrap
+    unwrap_or_return = unwrap
 
 
 class Err[E: BaseException](BaseResult[E]):
     """Represents an error result."""
 
+    __slots__ = ('_repr', '_trace')
     __match_args__ = ('error',)
 
     def __init__(self, error: E) -> None:
@@ -182,17 +202,29 @@ class Err[E: BaseException](BaseResult[E]):
             error (E): The exception representing the error.
         """
         self._value: E = error
+        self._repr: str | None = None
+        self._trace: tuple[TracebackType | None, str] | None = None
 
     def __repr__(self) -> str:
-        return f'{self.__class__.__name__}({format_exception(self._value)})'
+        if self._repr is None:
+            self._repr = f'{self._repr_prefix}{format_exception(self._value)})'
+        return self._repr
 
     def trace(self) -> str:
         """Get the formatted traceback of the error.
 
+        The trace is computed once and only recomputed if the exception has been raised again.
+
         Returns:
             str: The traceback string.
         """
-        return f'{format_traceback(self._value)}{format_exception(self._value)}'
+        tb = self._value.__traceback__
+        if self._trace is None or self._trace[0] is not tb:
+            self._trace = (
+                tb,
+                f'{format_traceback(self._value)}{format_exception(self._value)}',
+            )
+        return self._trace[1]
 
     @property
     def error(self) -> E:
@@ -214,6 +246,9 @@ class Err[E: BaseException](BaseResult[E]):
         """
         return True
 
+    def __bool__(self) -> bool:
+        return False
+
     def expect(self, msg: str) -> NoReturn:
         """Raise an `AssertionError` with the given message.
 
@@ -277,51 +312,114 @@ class Err[E: BaseException](BaseResult[E]):
         Raises:
             BaseException: The exception held by `Err`.
         """
-        self.unwrap_or_raise()
+        raise self._value from None
 
 
 type Result[T] = Ok[T] | Err[BaseException]
 """Type alias for `Result`, which can be an `Ok` or an `Err`."""
 
 
-def filter_traceback(e: BaseException) -> List[traceback.FrameSummary]:
-    tb = traceback.extract_tb(e.__traceback__)
-    return [
-        frame
-        for index, frame in enumerate(tb)
-        if not (
-            frame.name == 'unwrap_or_raise'
-            or frame.name == 'drresult_returns_result_wrapper'
-            or frame.name == 'drresult_constructs_as_result_wrapper'
-            or frame.name == 'log_panic'
-            or (
-                frame.name == '__call__'
-                and (index + 1) < len(tb)
-                and tb[index + 1].name == 'drresult_constructs_as_result_wrapper'
+# Code objects of the internal frames removed from tracebacks, compared by identity.
+# The decorator modules register their wrappers here when creating them.
+internal_frame_codes: set[CodeType] = {
+    Err.unwrap_or_raise.__code__,
+    Err.unwrap_or_return.__code__,
+}
+
+
+def filter_traceback(e: BaseException) -> list['traceback.FrameSummary']:
+    # This mirrors CPython internals of `traceback.extract_tb` (3.11 to 3.13), which has no public
+    # API taking a frame filter: `_walk_tb_with_full_positions` and `_get_code_position` for the
+    # positions behind the caret lines, and `StackSummary._extract_from_extended_frame_gen` for
+    # the `linecache` handling. Only the frames that are kept get a `FrameSummary`.
+    from traceback import FrameSummary
+    import linecache
+
+    frames = []
+    filenames = set()
+    tb = e.__traceback__
+    while tb is not None:
+        frame = tb.tb_frame
+        code = frame.f_code
+        if code not in internal_frame_codes:
+            if tb.tb_lasti < 0:
+                lineno, end_lineno, colno, end_colno = None, None, None, None
+            else:
+                lineno, end_lineno, colno, end_colno = next(
+                    islice(code.co_positions(), tb.tb_lasti // 2, None)
+                )
+            filenames.add(code.co_filename)
+            linecache.lazycache(code.co_filename, frame.f_globals)
+            frames.append(
+                FrameSummary(
+                    code.co_filename,
+                    tb.tb_lineno if lineno is None else lineno,
+                    code.co_name,
+                    lookup_line=False,
+                    end_lineno=end_lineno,
+                    colno=colno,
+                    end_colno=end_colno,
+                )
             )
-        )
-    ]
+        tb = tb.tb_next
+    # Drop cached source of files changed since they were read, so no stale lines are shown.
+    for filename in filenames:
+        linecache.checkcache(filename)
+    return frames
 
 
 def format_traceback(e: BaseException) -> str:
+    from traceback import format_list
+
     new_tb_list = filter_traceback(e)
-    trace_to_print = ''.join(traceback.format_list(new_tb_list))
+    trace_to_print = ''.join(format_list(new_tb_list))
     return trace_to_print
 
 
 def format_exception(e: BaseException) -> str:
-    return ''.join(traceback.format_exception_only(e))[:-1]
+    exc_type = type(e)
+    # Syntax errors and exceptions with notes span several lines, and `traceback` adds
+    # "Did you mean" suggestions to name lookup errors, so leave those to `traceback`.
+    if (
+        issubclass(exc_type, SyntaxError)
+        or hasattr(e, '__notes__')
+        or (
+            issubclass(exc_type, (NameError, AttributeError, ImportError))
+            and getattr(e, 'name', None) is not None
+        )
+    ):
+        from traceback import TracebackException
+
+        # With the traceback, `NameError` suggestions can look at the names in the failing frame.
+        exception = TracebackException(
+            exc_type, e, e.__traceback__, lookup_lines=False, compact=True
+        )
+        return ''.join(exception.format_exception_only())[:-1]
+    name = exc_type.__qualname__
+    module = exc_type.__module__
+    if module not in ('__main__', 'builtins'):
+        name = f'{module}.{name}'
+    try:
+        message = str(e)
+    except Exception:
+        message = '<exception str() failed>'
+    return f'{name}: {message}' if message else name
 
 
 def format_traceback_exception(e: BaseException) -> str:
     return f'{format_traceback(e)}{format_exception(e)}'
 
 
-def excepthook(type, e, traceback):
-    print(f'{format_traceback_exception(e)}')
+def excepthook(type, e, traceback, file=None):
+    print(f'{format_traceback_exception(e)}', file=file)
+
 
+def install_excepthook() -> None:
+    """Install `excepthook` as `sys.excepthook`.
 
-sys.excepthook = excepthook
+    Uncaught exceptions will then be printed with their filtered stack trace.
+    """
+    sys.excepthook = excepthook
 
 
 class Panic(Exception):
@@ -331,6 +429,8 @@ class Panic(Exception):
         unhandled_exception (BaseException): The original unhandled exception.
     """
 
+    __slots__ = ('unhandled_exception', '_message', '__weakref__')
+
     def __init__(self, unhandled_exception: BaseException):
         """Initialize a `Panic` exception.
 
@@ -339,9 +439,12 @@ class Panic(Exception):
         """
         self.unhandled_exception = unhandled_exception
         self.__traceback__ = self.unhandled_exception.__traceback__
+        self._message: str | None = None
 
     def __repr__(self) -> str:
-        return f'{format_exception(self.unhandled_exception)}'
+        if self._message is None:
+            self._message = format_exception(self.unhandled_exception)
+        return self._message
 
     def trace(self) -> str:
         """Get the formatted traceback and exception message.
@@ -349,7 +452,7 @@ class Panic(Exception):
         Returns:
             str: The traceback and exception message.
         """
-        return f'{format_traceback(self)}Panic: {format_exception(self.unhandled_exception)}'
+        return f'{format_traceback(self)}Panic: {self.__repr__()}'
 
     def __str__(self) -> str:
         return self.__repr__()
@@ -3,7 +3,7 @@
 
 from typing import Type
 
-from drresult import gather_result, Ok, Err, returns_result, Result, Panic, noexcept
+from drresult import gather_result, gather, Ok, Err, returns_result, Result, Panic, noexcept
 
 import pytest
 import os
@@ -17,6 +17,12 @@ def test_no_result_is_ok_none():
     assert result.unwrap() == None
 
 
+def test_gather_result_has_no_instance_dict():
+    with gather_result() as result:
+        pass
+    assert not hasattr(result, '__dict__')
+
+
 def test_no_error_receives_ok():
     with gather_result() as result:
         result.set(Ok('foo'))
@@ -59,6 +65,37 @@ def test_assertion_is_unhandled():
             result.set(Ok('foo'))
 
 
+def test_gather_returns_ok():
+    assert gather(lambda: 'foo') == Ok('foo')
+
+
+def test_gather_expected_error_returns_err():
+    result = gather(lambda: {}['foo'])
+    err = result.unwrap_err()
+    assert isinstance(err, KeyError)
+
+
+def test_gather_unexpected_error_raises_panic():
+    def func() -> str:
+        raise RuntimeError('bar')
+
+    with pytest.raises(Panic):
+        gather(func, expects=[IndexError, KeyError])
+
+
+def test_gather_exception_lists_are_keyword_only():
+    with pytest.raises(TypeError):
+        gather(lambda: 'foo', [KeyError])  # type: ignore[misc]
+
+
+def test_gather_assertion_is_unhandled():
+    def func() -> str:
+        assert False
+
+    with pytest.raises(Panic):
+        gather(func)
+
+
 def test_example(tmp_path):
     @returns_result()
     def parse_json_file(filename: str) -> Result[dict]:
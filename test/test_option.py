@@ -67,3 +67,7 @@ def test_some_is_true():
 def test_some_unwraps_value():
     some = Some('foo')
     assert some.unwrap() == 'foo'
+
+
+def test_some_has_no_instance_dict():
+    assert not hasattr(Some('foo'), '__dict__')
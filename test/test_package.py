@@ -0,0 +1,29 @@
+# Copyright 2024 Ole Kliemann
+# SPDX-License-Identifier: MIT
+
+import pytest
+import subprocess
+import sys
+
+# Each test runs in a fresh interpreter, as the outcome depends on what was imported before.
+
+
+@pytest.mark.parametrize(
+    'imports',
+    [
+        'from drresult import gather, gather_result',
+        'import drresult.gather_result; from drresult import gather_result',
+    ],
+    ids=['with-gather', 'after-submodule'],
+)
+def test_package_exports_gather_result_class(imports):
+    code = f'{imports}; assert isinstance(gather_result, type), gather_result'
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+@pytest.mark.parametrize('submodule', ['result', 'class_decorators', 'option', 'logging'])
+def test_package_exposes_submodules(submodule):
+    code = (
+        f'import drresult, sys; assert drresult.{submodule} is sys.modules["drresult.{submodule}"]'
+    )
+    subprocess.run([sys.executable, '-c', code], check=True)
@@ -4,8 +4,14 @@
 from typing import Type
 
 from drresult import Result, Ok, Err, returns_result, noexcept, Panic
+from drresult.function_decorators import without_subclasses
 
 import pytest
+import os
+import pickle
+import subprocess
+import sys
+import weakref
 
 
 class DummyException(Exception):
@@ -21,6 +27,12 @@ class DummyException(Exception):
         return hash(self.payload)
 
 
+# `@returns_result` and `@returns_result()` must behave the same.
+default_decorators = pytest.mark.parametrize(
+    'decorator', [returns_result, returns_result()], ids=['bare', 'called']
+)
+
+
 def test_equal_ok_is_equal():
     lhs = Ok('foo')
     rhs = Ok('foo')
@@ -63,12 +75,55 @@ def test_equal_err_is_not_equal_everything():
     assert not (lhs == rhs)
 
 
+def test_ok_prints_correctly():
+    assert str(Ok('foo')) == 'Ok(foo)'
+
+
+def test_err_prints_correctly():
+    assert str(Err(KeyError('foo'))) == "Err(KeyError: 'foo')"
+
+
 def test_equal_ok_has_identical_hash():
     lhs = Ok('foo')
     rhs = Ok('foo')
     assert hash(lhs) == hash(rhs)
 
 
+def test_ok_hash_is_stable():
+    result = Ok('foo')
+    assert hash(result) == hash(result) == hash(Ok('foo'))
+
+
+def test_ok_with_nan_is_not_equal_to_itself():
+    result = Ok(float('nan'))
+    assert not (result == result)
+
+
+def test_unpickled_ok_hashes_like_a_fresh_one():
+    # String hashes differ between processes, so the hash cached before pickling must not survive.
+    setup = 'import pickle, sys; from drresult import Ok; '
+    dump = setup + 'r = Ok("foo"); hash(r); sys.stdout.buffer.write(pickle.dumps(r))'
+    load = setup + 'assert pickle.load(sys.stdin.buffer) in {Ok("foo")}'
+    data = subprocess.run(
+        [sys.executable, '-c', dump],
+        env={**os.environ, 'PYTHONHASHSEED': '1'},
+        check=True,
+        capture_output=True,
+    ).stdout
+    subprocess.run(
+        [sys.executable, '-c', load],
+        env={**os.environ, 'PYTHONHASHSEED': '2'},
+        input=data,
+        check=True,
+    )
+
+
+def test_ok_pickles():
+    result = Ok('foo')
+    hash(result)
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
 def test_different_ok_has_different_hash():
     lhs = Ok('foo')
     rhs = Ok('bar')
@@ -81,6 +136,16 @@ def test_equal_value_ok_err_has_different_hash():
     assert not (hash(lhs) == hash(rhs))
 
 
+def test_ok_and_err_have_no_instance_dict():
+    assert not hasattr(Ok('foo'), '__dict__')
+    assert not hasattr(Err(DummyException('foo')), '__dict__')
+
+
+def test_panic_supports_weak_references():
+    panic = Panic(ValueError('foo'))
+    assert weakref.ref(panic)() is panic
+
+
 def test_ok_is_ok():
     result = Ok('foo')
     assert result.is_ok()
@@ -123,13 +188,13 @@ def test_ok_unwraps_value():
 
 def test_ok_not_expects_err():
     result = Ok('foo')
-    with pytest.raises(AssertionError):
+    with pytest.raises(AssertionError, match=r'^Ok\(foo\): bar$'):
         result.expect_err('bar')
 
 
 def test_ok_not_unwraps_err():
     result = Ok('foo')
-    with pytest.raises(AssertionError):
+    with pytest.raises(AssertionError, match=r'^Ok\(foo\)$'):
         result.unwrap_err()
 
 
@@ -138,30 +203,9 @@ def test_ok_unwraps_value_not_or():
     assert result.unwrap_or('bar') == 'foo'
 
 
-def test_ok_unwraps_value_not_raises():
-    @returns_result()
-    def func() -> Result[str]:
-        result = Ok('foo')
-        result.unwrap_or_raise()
-        return Ok('bar')
-
-    result = func()
-    assert result.is_ok() and result.unwrap() == 'bar'
-
-
-def test_ok_unwraps_value_not_returns():
-    @returns_result()
-    def func() -> Result[str]:
-        result = Ok('foo')
-        result.unwrap_or_return()
-        return Ok('bar')
-
-    result = func()
-    assert result.is_ok() and result.unwrap() == 'bar'
-
-
-def test_ok_unwraps_value_not_raises_decorator_default():
-    @returns_result
+@default_decorators
+def test_ok_unwraps_value_not_raises(decorator):
+    @decorator
     def func() -> Result[str]:
         result = Ok('foo')
         result.unwrap_or_raise()
@@ -171,8 +215,9 @@ def test_ok_unwraps_value_not_raises_decorator_default():
     assert result.is_ok() and result.unwrap() == 'bar'
 
 
-def test_ok_unwraps_value_not_returns_decorator_default():
-    @returns_result
+@default_decorators
+def test_ok_unwraps_value_not_returns(decorator):
+    @decorator
     def func() -> Result[str]:
         result = Ok('foo')
         result.unwrap_or_return()
@@ -274,21 +319,9 @@ def test_result_decorator_catches_exception_specified():
     assert str(result) == 'foo'
 
 
-def test_result_decorator_catches_all_exceptions_by_default():
-    @returns_result()
-    def func() -> Result[str]:
-        raise KeyError('foo')
-        return Ok('bar')
-
-    result = func()
-    assert result.is_err()
-    result = result.unwrap_err()
-    assert isinstance(result, KeyError)
-    assert str(result) == "'foo'"
-
-
-def test_result_decorator_catches_all_exceptions_by_default_decorator_default():
-    @returns_result
+@default_decorators
+def test_result_decorator_catches_all_exceptions_by_default(decorator):
+    @decorator
     def func() -> Result[str]:
         raise KeyError('foo')
         return Ok('bar')
@@ -300,18 +333,9 @@ def test_result_decorator_catches_all_exceptions_by_default_decorator_default():
     assert str(result) == "'foo'"
 
 
-def test_result_decorator_not_catches_assert_by_default():
-    @returns_result()
-    def func() -> Result[str]:
-        assert False
-        return Ok('bar')
-
-    with pytest.raises(Panic):
-        result = func()
-
-
-def test_result_decorator_not_catches_assert_by_default_decorator_default():
-    @returns_result
+@default_decorators
+def test_result_decorator_not_catches_assert_by_default(decorator):
+    @decorator
     def func() -> Result[str]:
         assert False
         return Ok('bar')
@@ -350,6 +374,37 @@ def test_result_decorator_not_catches_exception_not_specified():
         result = func()
 
 
+def test_result_decorator_is_shared_for_identical_expects():
+    assert returns_result(expects=[KeyError]) is returns_result(expects=[KeyError])
+    assert returns_result(expects=[KeyError]) is not returns_result(expects=[IndexError])
+
+
+def test_without_subclasses_keeps_only_base_classes():
+    assert without_subclasses((KeyError, LookupError, KeyError, ValueError)) == (
+        LookupError,
+        ValueError,
+    )
+
+
+def test_result_decorator_catches_exception_covered_by_base_class():
+    @returns_result(expects=[KeyError, LookupError])
+    def func() -> Result[str]:
+        raise IndexError('foo')
+
+    assert isinstance(func().unwrap_err(), IndexError)
+
+
+def test_result_decorator_preserves_function_name():
+    @returns_result
+    def func() -> Result[str]:
+        """Docstring."""
+        return Ok('foo')
+
+    assert func.__name__ == 'func'
+    assert func.__doc__ == 'Docstring.'
+    assert func.__wrapped__ is not None
+
+
 def test_pattern_matching_ok_matches_ok():
     result = Ok('foo')
     match result:
@@ -372,28 +427,37 @@ def test_pattern_matching_err_matches_err():
             assert False
 
 
-def test_pattern_matching_with_exceptions_works():
-    data = [{'foo': 'value-1'}, {'bar': 'value-2'}]
-
-    @returns_result(expects=[IndexError, KeyError, RuntimeError])
-    def retrieve_record_entry_backend(index: int, key: str) -> Result[str]:
-        if key == 'baz':
-            raise RuntimeError(123)
-        return Ok(data[index][key])
-
-    def retrieve_record_entry(index: int, key: str) -> str:
-        match retrieve_record_entry_backend(index, key):
-            case Ok(v):
-                return f'Retrieved: {v}'
-            case Err(IndexError()):
-                return f'No such record: {index}'
-            case Err(KeyError()):
-                return f'No entry `{key}` in record {index}'
-            case Err(RuntimeError() as e):
-                return f'Error: {e}'
-            case _:
-                assert False
+def test_pattern_matching_uses_public_attributes():
+    assert Ok.__match_args__ == ('value',)
+    assert Err.__match_args__ == ('error',)
 
+
+records = [{'foo': 'value-1'}, {'bar': 'value-2'}]
+
+
+@returns_result(expects=[IndexError, KeyError, RuntimeError])
+def retrieve_record_entry_backend(index: int, key: str) -> Result[str]:
+    if key == 'baz':
+        raise RuntimeError(123)
+    return Ok(records[index][key])
+
+
+def retrieve_record_entry(index: int, key: str) -> str:
+    # `returns_result` is annotated to return either the wrapper or a decorator, mypy can't tell.
+    match retrieve_record_entry_backend(index, key):  # type: ignore[operator]
+        case Ok(v):
+            return f'Retrieved: {v}'
+        case Err(IndexError()):
+            return f'No such record: {index}'
+        case Err(KeyError()):
+            return f'No entry `{key}` in record {index}'
+        case Err(RuntimeError() as e):
+            return f'Error: {e}'
+        case _:
+            assert False
+
+
+def test_pattern_matching_with_exceptions_works():
     assert retrieve_record_entry(2, 'foo') == 'No such record: 2'
     assert retrieve_record_entry(1, 'foo') == 'No entry `foo` in record 1'
     assert retrieve_record_entry(1, 'bar') == 'Retrieved: value-2'
@@ -409,6 +473,14 @@ def test_noexcept_returns_when_no_exception():
     assert result == 'bar'
 
 
+def test_noexcept_preserves_function_name():
+    @noexcept
+    def func() -> str:
+        return 'bar'
+
+    assert func.__name__ == 'func'
+
+
 def test_noexcept_raises_panic_on_exception():
     @noexcept
     def func() -> str:
@@ -1,198 +1,351 @@
 # Copyright 2024 Ole Kliemann
 # SPDX-License-Identifier: MIT
 
-from drresult import returns_result, constructs_as_result, log_panic, Panic, Err
-from drresult.result import filter_traceback, excepthook
-
+from drresult import returns_result, constructs_as_result, gather_result, log_panic, Panic, Err
+from drresult.result import (
+    filter_traceback,
+    format_traceback,
+    format_exception,
+    excepthook,
+    install_excepthook,
+    internal_frame_codes,
+)
+from drresult.logging import ignore_logged_panic
+
+import copy
+import importlib.util
+import io
+import logging
+import pickle
 import traceback
 import pytest
+import subprocess
+import sys
 
 
-def test_traceback_on_panic():
-    @returns_result()
-    def f1():
-        return f2().unwrap_or_raise()
+@returns_result()
+def f1(exc_type):
+    return f2(exc_type).unwrap_or_raise()
 
-    @returns_result()
-    def f2():
-        return f3().unwrap_or_raise()
 
-    @returns_result()
-    def f3():
-        a = {}
-        raise SystemError('foo')
-        a['bar'] = 'baz'
+@returns_result()
+def f2(exc_type):
+    return f3(exc_type).unwrap_or_raise()
 
-    exc = None
-    try:
-        result = f1()
-    except Panic as e:
-        exc = e
 
-    assert exc
+@returns_result()
+def f3(exc_type):
+    raise exc_type('foo')
+
+
+@constructs_as_result
+class Constructed:
+    def __init__(self, exc_type):
+        self.result = f1(exc_type).unwrap_or_raise()
+
+
+# The chain is either called directly or from a constructor wrapped by `constructs_as_result`.
+callers = pytest.mark.parametrize(
+    'call, frames',
+    [
+        pytest.param(f1, ['f1', 'f2', 'f3'], id='function'),
+        pytest.param(Constructed, ['__init__', 'f1', 'f2', 'f3'], id='constructor'),
+    ],
+)
+
+
+@callers
+def test_traceback_on_panic(call, frames):
+    with pytest.raises(Panic) as exc_info:
+        call(SystemError)
+    exc = exc_info.value
+
     tb = filter_traceback(exc)
-    assert len(tb) == 4
-    assert tb[0].name == 'test_traceback_on_panic'
-    assert tb[1].name == 'f1'
-    assert tb[2].name == 'f2'
-    assert tb[3].name == 'f3'
+    assert [frame.name for frame in tb] == ['test_traceback_on_panic', *frames]
 
     msg = exc.trace()
     print(msg)
     assert 'Panic' in msg and 'f1' in msg and 'f2' in msg and 'f3' in msg
 
 
-def test_traceback_from_err():
-    @returns_result()
-    def f1():
-        return f2().unwrap_or_raise()
-
-    @returns_result()
-    def f2():
-        return f3().unwrap_or_raise()
-
-    @returns_result()
-    def f3():
-        a = {}
-        a['bar'] = a['baz']
-
-    result = f1()
+@callers
+def test_traceback_from_err(call, frames):
+    result = call(KeyError)
 
     assert not result
     tb = filter_traceback(result.unwrap_err())
-    assert len(tb) == 3
-    assert tb[0].name == 'f1'
-    assert tb[1].name == 'f2'
-    assert tb[2].name == 'f3'
+    assert [frame.name for frame in tb] == frames
 
     msg = result.trace()
     assert 'f1' in msg and 'f2' in msg and 'f3' in msg
 
 
-def test_traceback_on_panic_in_constructor():
+def frame_positions(frames):
+    return [
+        (f.filename, f.lineno, f.name, f.end_lineno, f.colno, f.end_colno, f.line) for f in frames
+    ]
+
+
+# `filter_traceback` mirrors CPython internals, so it is pinned against `traceback.extract_tb`
+# with the internal frames filtered out, on whichever interpreter runs the tests.
+@callers
+@pytest.mark.parametrize('kind', ['panic', 'err'])
+def test_filter_traceback_matches_extract_tb(call, frames, kind):
+    if kind == 'panic':
+        with pytest.raises(Panic) as exc_info:
+            call(SystemError)
+        e: BaseException = exc_info.value
+    else:
+        e = call(KeyError).unwrap_err()
+
+    tb = e.__traceback__
+    expected = [
+        summary
+        for (frame, _), summary in zip(traceback.walk_tb(tb), traceback.extract_tb(tb))
+        if frame.f_code not in internal_frame_codes
+    ]
+    assert frame_positions(filter_traceback(e)) == frame_positions(expected)
+
+
+def test_traceback_from_err_via_unwrap_or_return():
     @returns_result()
     def f1():
-        return f2().unwrap_or_raise()
+        return f2().unwrap_or_return()
 
     @returns_result()
     def f2():
-        return f3().unwrap_or_raise()
+        raise ValueError('foo')
 
-    @returns_result()
-    def f3():
-        a = {}
-        raise SystemError('foo')
-        a['bar'] = 'baz'
-
-    @constructs_as_result
-    class A:
-        def __init__(self):
-            self.result = f1()
-
-    exc = None
-    try:
-        a = A()
-    except Panic as e:
-        exc = e
+    result = f1()
 
-    assert exc
-    tb = filter_traceback(exc)
-    assert len(tb) == 5
-    assert tb[0].name == 'test_traceback_on_panic_in_constructor'
-    assert tb[1].name == '__init__'
-    assert tb[2].name == 'f1'
-    assert tb[3].name == 'f2'
-    assert tb[4].name == 'f3'
+    assert not result
+    tb = filter_traceback(result.unwrap_err())
+    assert [frame.name for frame in tb] == ['f1', 'f2']
 
 
-def test_traceback_from_err_in_constructor():
+def test_err_trace_is_recomputed_when_raised_again():
     @returns_result()
     def f1():
-        return f2().unwrap_or_raise()
+        return result.unwrap_or_raise()
 
     @returns_result()
     def f2():
-        return f3().unwrap_or_raise()
-
-    @returns_result()
-    def f3():
         a = {}
         a['bar'] = a['baz']
 
-    @constructs_as_result
-    class A:
-        def __init__(self):
-            self.result = f1().unwrap_or_raise()
+    result = f2()
+    msg = result.trace()
+    assert result.trace() is msg
+    assert 'f1' not in msg
 
-    a = A()
+    f1()
+    assert 'f1' in result.trace()
 
-    assert not a
-    tb = filter_traceback(a.unwrap_err())
-    assert len(tb) == 4
-    assert tb[0].name == '__init__'
-    assert tb[1].name == 'f1'
-    assert tb[2].name == 'f2'
-    assert tb[3].name == 'f3'
 
+def test_err_pickles_and_copies_after_trace():
+    result = f1(KeyError)
+    result.trace()
 
-def test_log_panic():
-    class DummyLogger:
-        def __init__(self):
-            self.msg = None
+    for copied in (pickle.loads(pickle.dumps(result)), copy.deepcopy(result)):
+        assert isinstance(copied, Err)
+        assert repr(copied) == repr(result)
 
-        def critical(self, msg):
-            self.msg = msg
 
-    @returns_result()
-    def f1():
-        return f2().unwrap_or_raise()
+def test_traceback_shows_current_source_after_file_changed(tmp_path):
+    path = tmp_path / 'changing_module.py'
+    path.write_text("def fail():\n    raise ValueError('foo')\n")
+    spec = importlib.util.spec_from_file_location('changing_module', path)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
 
-    @returns_result()
-    def f2():
-        return f3().unwrap_or_raise()
+    with pytest.raises(ValueError) as exc_info:
+        module.fail()
+    assert "raise ValueError('foo')" in format_traceback(exc_info.value)
 
+    path.write_text("def fail():\n    raise ValueError('changed source')\n")
+    assert "raise ValueError('changed source')" in format_traceback(exc_info.value)
+
+
+def test_traceback_keeps_user_frames_named_like_internal_ones():
     @returns_result()
-    def f3():
-        a = {}
-        raise SystemError('foo')
-        a['bar'] = 'baz'
+    def unwrap_or_raise():
+        raise ValueError('foo')
 
+    result = unwrap_or_raise()
+
+    assert not result
+    tb = filter_traceback(result.unwrap_err())
+    assert len(tb) == 1
+    assert tb[0].name == 'unwrap_or_raise'
+
+
+class DummyLogger:
+    def __init__(self):
+        self.msg = None
+
+    def critical(self, msg):
+        self.msg = msg
+
+
+def test_log_panic():
     logger = DummyLogger()
     with pytest.raises(Panic):
         with log_panic(logger):
-            f1()
+            f1(SystemError)
     assert logger.msg
     assert 'SystemError' in logger.msg and 'foo' in logger.msg
     assert 'f3' in logger.msg and 'f2' in logger.msg and 'f1' in logger.msg
     assert not 'in log_panic' in logger.msg
+    assert sys.excepthook is ignore_logged_panic
 
 
-def test_excepthook(capsys):
-    @returns_result()
-    def f1():
-        return f2().unwrap_or_raise()
+def test_log_panic_converts_exception_to_panic():
+    logger = DummyLogger()
+    with pytest.raises(Panic):
+        with log_panic(logger):
+            raise KeyError('foo')
+    assert logger.msg
+    assert 'Panic' in logger.msg and 'KeyError' in logger.msg
 
-    @returns_result()
-    def f2():
-        return f3().unwrap_or_raise()
 
-    @returns_result()
-    def f3():
-        a = {}
-        raise SystemError('foo')
-        a['bar'] = 'baz'
+@pytest.mark.parametrize(
+    'context',
+    [lambda: gather_result(), lambda: log_panic(logging.getLogger(__name__))],
+    ids=['gather', 'log'],
+)
+def test_panic_from_context_manager_omits_exit_frame(context):
+    with pytest.raises(Panic) as exc_info:
+        with context():
+            raise SystemError('foo')
+
+    tb = filter_traceback(exc_info.value)
+    assert '__exit__' not in [frame.name for frame in tb]
+    assert tb[-1].name == 'test_panic_from_context_manager_omits_exit_frame'
+
+
+def test_log_panic_keeps_excepthook_without_panic(monkeypatch):
+    monkeypatch.setattr(sys, 'excepthook', sys.__excepthook__)
+    with log_panic(logging.getLogger(__name__)):
+        pass
+    assert sys.excepthook is sys.__excepthook__
+
+
+def test_log_panic_passes_other_exceptions_to_previous_excepthook(monkeypatch):
+    reported = []
+    monkeypatch.setattr(sys, 'excepthook', lambda type, e, traceback: reported.append(e))
+    monkeypatch.setattr('drresult.logging._previous_excepthook', sys.__excepthook__)
+    with pytest.raises(Panic) as exc_info:
+        with log_panic(logging.getLogger(__name__)):
+            raise KeyError('foo')
+    assert sys.excepthook is ignore_logged_panic
+
+    error = RuntimeError('bar')
+    sys.excepthook(RuntimeError, error, None)
+    sys.excepthook(Panic, exc_info.value, None)
+    sys.excepthook(Panic, Panic(KeyError('foo')), None)
+    assert reported[0] is error
+    assert len(reported) == 2 and reported[1] is not exc_info.value
+
+
+def test_excepthook():
+    with pytest.raises(Panic) as exc_info:
+        f1(SystemError)
+
+    output = io.StringIO()
+    excepthook(None, exc_info.value, None, file=output)
+    text = output.getvalue()
+    assert 'Panic' in text
+    assert 'SystemError' in text
+    assert 'foo' in text
+    assert 'f3' in text
+    assert 'f2' in text
+    assert 'f1' in text
+
+
+def test_excepthook_prints_to_stdout_by_default(capsys):
+    excepthook(None, Panic(SystemError('foo')), None)
+    assert 'SystemError: foo' in capsys.readouterr().out
+
+
+def test_import_does_not_install_excepthook():
+    code = 'import sys, drresult.result; assert sys.excepthook is sys.__excepthook__'
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_import_does_not_load_traceback():
+    code = 'import sys, drresult.result; assert "traceback" not in sys.modules'
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_install_excepthook(monkeypatch):
+    monkeypatch.setattr(sys, 'excepthook', sys.__excepthook__)
+    install_excepthook()
+    assert sys.excepthook is excepthook
+
+
+class DummyException(Exception):
+    pass
+
+
+class UnprintableException(Exception):
+    def __str__(self):
+        raise RuntimeError('unprintable')
+
+
+def make_exception_with_note() -> Exception:
+    e = ValueError('foo')
+    e.add_note('bar')
+    return e
+
+
+class Named:
+    foo = 1
+
+
+def misspell_attribute():
+    return Named().fooo  # type: ignore[attr-defined]
+
+
+def misspell_name():
+    known_name = 1
+    return known_nam  # type: ignore[name-defined]
+
+
+def misspell_import():
+    from os import pathh  # type: ignore[attr-defined]
+
 
-    exc = None
+def raised(func) -> BaseException:
     try:
-        result = f1()
-    except Panic as e:
-        exc = e
-
-    excepthook(None, exc, None)
-    captured = capsys.readouterr()
-    assert 'Panic' in captured.out
-    assert 'SystemError' in captured.out
-    assert 'foo' in captured.out
-    assert 'f3' in captured.out
-    assert 'f2' in captured.out
-    assert 'f1' in captured.out
+        func()
+    except BaseException as e:
+        return e
+    raise AssertionError(f'{func.__name__} did not raise')
+
+
+misspelled = [raised(misspell_attribute), raised(misspell_name), raised(misspell_import)]
+
+
+@pytest.mark.parametrize('e', misspelled)
+def test_format_exception_keeps_suggestions(e):
+    assert 'Did you mean' in format_exception(e)
+
+
+@pytest.mark.parametrize(
+    'e',
+    [
+        *misspelled,
+        KeyError('foo'),
+        ValueError(''),
+        RuntimeError(1, 2),
+        DummyException('foo\nbar'),
+        UnprintableException(),
+        SyntaxError('foo', ('file.py', 1, 2, 'a b')),
+        make_exception_with_note(),
+    ],
+)
+def test_format_exception_matches_traceback(e):
+    # The exception lines the default excepthook prints.
+    lines = traceback.TracebackException.from_exception(e).format_exception_only()
+    assert format_exception(e) == ''.join(lines)[:-1]